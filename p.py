@@ -7,31 +7,70 @@ Bahasa: Indonesian log messages.
 """
 
 import os
+import re
+import sys
+import logging
 import json
 import time
-import requests
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+import httpx
+import orjson
+from eth_abi import decode as abi_decode
 from web3 import Web3
+from web3.exceptions import TimeExhausted
+from web3.providers import JSONBaseProvider
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger("kyoko")
+
+# ABI-encoded revert payload: Error(string) (selector + offset word + length word + string)
+# or Panic(uint256) (selector + one word)
+_REVERT_HEX_RE = re.compile(r"0x(?:08c379a0[0-9a-fA-F]{128,}|4e487b71[0-9a-fA-F]{64})")
+_ERROR_SELECTOR = b"\x08\xc3\x79\xa0"  # Error(string)
+_PANIC_SELECTOR = b"\x4e\x48\x7b\x71"  # Panic(uint256)
+
+# fixed unit factors, instead of web3's unit-table lookups in the swap loop
+_WEI_PER_ETH = 10 ** 18
+_WEI_PER_GWEI = 10 ** 9
+# how long a fetched pending block is reused for fee derivation (seconds)
+_PENDING_BLOCK_TTL = 1.0
+
+
+@functools.lru_cache(maxsize=32)
+def eth_to_wei(amount_eth) -> int:
+    """ETH (float/str) to wei, exact like Web3.to_wei: goes through Decimal(str(x)), cached per amount."""
+    return int(Decimal(str(amount_eth)) * _WEI_PER_ETH)
+
+
 def hex_or_int_to_int(x):
     """Convert possible hex string (0x...) or int/string decimal to int safely."""
     if isinstance(x, int):
         return x
     if isinstance(x, str):
         x = x.strip()
-        if x.startswith("0x") or x.startswith("0X"):
-            return int(x, 16)
-        return int(x)
+        try:
+            # base 0 auto-detects the 0x prefix
+            return int(x, 0)
+        except ValueError:
+            # base 0 rejects zero-padded decimals like "0100"
+            return int(x, 10)
     raise ValueError("Unsupported value type for conversion to int: %r" % (type(x),))
 
 
+@functools.lru_cache(maxsize=256)
 def decode_revert_reason(data_hex: str) -> str:
     """
     Decode Solidity revert reason if present.
-    Typical ABI-encoded revert: 0x08c379a0 + offset + str_len + str_bytes
+    Error(string): 0x08c379a0 + ABI-encoded string -> the string.
+    Panic(uint256): 0x4e487b71 + ABI-encoded code -> "Panic(0x..)".
     Returns decoded string or empty string if can't decode.
+    Cached: the same revert payload tends to repeat across retries.
     """
     try:
         if not data_hex or not isinstance(data_hex, str):
@@ -39,22 +78,65 @@ def decode_revert_reason(data_hex: str) -> str:
         if data_hex.startswith("0x"):
             data_hex = data_hex[2:]
         b = bytes.fromhex(data_hex)
-        if len(b) < 4:
-            return ""
-        selector = b[:4].hex()
-        # 0x08c379a0 is Error(string) selector
-        if selector != "08c379a0":
-            return ""
-        # skip selector (4) + 32 offset; next 32 bytes is string length
-        if len(b) < 4 + 32 + 32:
-            return ""
-        str_len = int.from_bytes(b[4 + 32:4 + 32 + 32], "big")
-        reason_bytes = b[4 + 32 + 32:4 + 32 + 32 + str_len]
-        return reason_bytes.decode(errors="replace")
+        selector = b[:4]
+        # strict=False: some nodes trim the zero padding after the string
+        if selector == _ERROR_SELECTOR:
+            # same wire layout as bytes; decode the text ourselves so invalid UTF-8 isn't fatal
+            return abi_decode(["bytes"], b[4:], strict=False)[0].decode(errors="replace")
+        if selector == _PANIC_SELECTOR:
+            return "Panic(0x%x)" % abi_decode(["uint256"], b[4:], strict=False)[0]
+        return ""
     except Exception:
         return ""
 
 
+def revert_reason_from_exception(exc) -> str:
+    """
+    Best-effort revert reason from a web3/RPC exception: ContractLogicError.data,
+    Error(string) hex embedded in the message, or the 'execution reverted' text.
+    Returns empty string if nothing usable is found.
+    """
+    data = getattr(exc, "data", None)
+    if isinstance(data, str):
+        reason = decode_revert_reason(data)
+        if reason:
+            return reason
+    msg = str(exc)
+    m = _REVERT_HEX_RE.search(msg)
+    if m:
+        reason = decode_revert_reason(m.group(0))
+        if reason:
+            return reason
+    idx = msg.find("execution reverted")
+    if idx >= 0:
+        return msg[idx:]
+    return ""
+
+
+class HttpxProvider(JSONBaseProvider):
+    """Minimal web3 provider: JSON-RPC POSTs over a shared httpx client (HTTP/2, pooled)."""
+
+    def __init__(self, endpoint_uri: str, client: httpx.Client):
+        super().__init__()
+        self.endpoint_uri = endpoint_uri
+        self._client = client
+
+    def make_request(self, method, params):
+        r = self._client.post(self.endpoint_uri, content=self.encode_rpc_request(method, params),
+                              headers={"Content-Type": "application/json"})
+        r.raise_for_status()
+        return self.decode_rpc_response(r.content)
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        # the base class only catches OSError; httpx errors are not OSError subclasses
+        try:
+            return super().is_connected(show_traceback)
+        except httpx.HTTPError:
+            if show_traceback:
+                raise
+            return False
+
+
 class KyokoSwapBot:
     def __init__(self,
                  private_key: str,
@@ -64,24 +146,34 @@ class KyokoSwapBot:
                  usdc_address: str = "0xbA9986D2381edf1DA03B0B9c1f8b00dc4AacC369",
                  weth_placeholder: str = "0xeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeee",
                  gas_buffer_multiplier: float = 1.2,
+                 quote_cache_ttl: float = 3.0,
+                 rpc_timeout: float = 8.0,
                  dry_run: bool = False):
-        self.PRIVATE_KEY = private_key
         self.RPC_URL = rpc_url
         self.KYOKO_API_URL = kyoko_api_url
         self.ROUTER_ADDRESS = router_address
         self.USDC_ADDRESS = usdc_address
         self.WETH_ADDRESS = weth_placeholder
         self.GAS_BUFFER_MULTIPLIER = float(gas_buffer_multiplier)
+        # keep TTL <= block time; the cache is also dropped whenever a tx is sent
+        self.QUOTE_CACHE_TTL = float(quote_cache_ttl)
+        # per-request timeout for every RPC call, so a hung node can't freeze the loop
+        self.RPC_TIMEOUT = float(rpc_timeout)
         self.DRY_RUN = bool(dry_run)
 
+        # Shared keep-alive HTTP/2 client for Kyoko API + RPC (multiplexed, retry on connect errors)
+        self._http_limits = httpx.Limits(max_keepalive_connections=8)
+        self._http = httpx.Client(http2=True, timeout=httpx.Timeout(self.RPC_TIMEOUT),
+                                  transport=httpx.HTTPTransport(http2=True, retries=3, limits=self._http_limits))
+
         # Init web3
-        self.w3 = Web3(Web3.HTTPProvider(self.RPC_URL))
+        self.w3 = Web3(HttpxProvider(self.RPC_URL, self._http))
         if not self.w3.is_connected():
             raise Exception("❌ Gagal connect karo RPC")
 
-        # Setup account
-        self.account = self.w3.eth.account.from_key(self.PRIVATE_KEY)
-        print(f"✅ Wallet: {self.account.address}")
+        # Setup account; the raw key string is not kept after this, the LocalAccount signs
+        self.account = self.w3.eth.account.from_key(private_key)
+        logger.info("✅ Wallet: %s", self.account.address)
 
         # Minimal USDC ABI (balanceOf, decimals)
         self.USDC_ABI = [
@@ -90,13 +182,75 @@ class KyokoSwapBot:
             {"constant": True, "inputs": [], "name": "decimals", "outputs": [{"name": "", "type": "uint8"}],
              "type": "function"}
         ]
-        self.usdc_contract = self.w3.eth.contract(address=Web3.to_checksum_address(self.USDC_ADDRESS),
+        self._checksum_cache: dict[str, str] = {}
+        self.usdc_contract = self.w3.eth.contract(address=self._checksum(self.USDC_ADDRESS),
                                                   abi=self.USDC_ABI)
+        # bound contract calls / calldata, built once instead of on every balance check
+        self._bal_fn = self.usdc_contract.functions.balanceOf(self.account.address)
+        self._dec_fn = self.usdc_contract.functions.decimals()
+        self._bal_calldata = self._encode_call("balanceOf", [self.account.address])
 
-    def supports_eip1559(self) -> bool:
-        """Detect if chain supports EIP-1559 by checking baseFeePerGas in pending/latest block."""
+        # Chain/token invariants, fetched once for the bot's lifetime
+        self._chain_id = self.w3.eth.chain_id
+        try:
+            self._usdc_decimals = self._dec_fn.call()
+        except Exception:
+            self._usdc_decimals = None  # retried lazily in check_balances
+        # (monotonic fetch time, pending baseFee as int) shared by every fee lookup within _PENDING_BLOCK_TTL;
+        # seeded by supports_eip1559
+        self._pending_base_fee = None
+        # None = not determined yet (RPC error at startup); re-detected before the next swap
+        self._eip1559 = self.supports_eip1559()
+
+        # (amount_wei, slippage) -> (monotonic fetch time, quote json)
+        self._quote_cache: dict[tuple, tuple[float, dict]] = {}
+        # last good fee readings, used when the node times out
+        self._last_base_fee = None
+        self._last_gas_price = None
+
+        # per-quote immutable tx parts: (quote object, (template, tx_info))
+        self._template_cache = None
+        # set on Ctrl+C: worker threads must not broadcast (or keep waiting on receipts) after it
+        self._stop = threading.Event()
+
+    def _batch_rpc(self, calls, timeout=None):
+        """
+        Send several JSON-RPC calls in a single batch POST to the RPC.
+        calls: list of (method, params). Returns results in the same order;
+        an entry is None if that call errored (callers fall back to web3).
+        """
+        payload = [{"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+                   for i, (method, params) in enumerate(calls)]
+        results = [None] * len(calls)
+        try:
+            r = self._http.post(self.RPC_URL, json=payload, timeout=timeout or self.RPC_TIMEOUT)
+            r.raise_for_status()
+            data = r.json()
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("⚠️ Batch RPC gagal: %s", e)
+            return results
+        # some nodes answer a batch with a single error object
+        if not isinstance(data, list):
+            return results
+        for item in data:
+            idx = item.get("id")
+            if isinstance(idx, int) and 0 <= idx < len(results) and "error" not in item:
+                results[idx] = item.get("result")
+        return results
+
+    def _encode_call(self, fn_name, args=None):
+        """ABI-encode a USDC contract call (web3 v7 encode_abi / v6 encodeABI)."""
+        encoder = getattr(self.usdc_contract, "encode_abi", None) or self.usdc_contract.encodeABI
+        return encoder(fn_name, args or [])
+
+    def supports_eip1559(self):
+        """
+        Detect if chain supports EIP-1559 by checking baseFeePerGas in pending/latest block.
+        Returns None if neither block could be read (timeout/RPC error), so callers can retry.
+        """
         try:
             blk = self.w3.eth.get_block("pending")
+            self._remember_pending_block(blk)
             return "baseFeePerGas" in blk and blk["baseFeePerGas"] is not None
         except Exception:
             # fallback try latest
@@ -104,13 +258,17 @@ class KyokoSwapBot:
                 blk = self.w3.eth.get_block("latest")
                 return "baseFeePerGas" in blk and blk["baseFeePerGas"] is not None
             except Exception:
-                return False
+                return None
 
-    def get_quote_from_kyoko(self, amount_eth, slippage=0.01, timeout=30):
-        """Request route/quote from Kyoko API with tolerant parsing."""
-        print("🔄 Njaluk quote soko Kyoko API...")
-        # Convert to wei
-        amount_wei = self.w3.to_wei(amount_eth, "ether")
+    def _ensure_eip1559(self):
+        """Re-detect EIP-1559 support if startup detection failed; while still unknown, swaps use legacy gasPrice."""
+        if self._eip1559 is None:
+            self._eip1559 = self.supports_eip1559()
+            if self._eip1559 is None:
+                logger.warning("⚠️ Ora iso ndeteksi EIP-1559, swap iki nganggo gasPrice legacy")
+
+    def _kyoko_request(self, amount_wei, slippage):
+        """Build (payload, headers) for a Kyoko route request."""
         payload = {
             "origin": self.account.address,
             "slippage": slippage,
@@ -122,30 +280,66 @@ class KyokoSwapBot:
             "Origin": "https://app.kyo.finance",
             "Referer": "https://app.kyo.finance/"
         }
+        return payload, headers
+
+    def _cached_quote(self, key):
+        """Return the cached quote for key if younger than QUOTE_CACHE_TTL, else None."""
+        hit = self._quote_cache.get(key)
+        if hit is None:
+            return None
+        age = time.monotonic() - hit[0]
+        if age >= self.QUOTE_CACHE_TTL:
+            return None
+        logger.info("♻️ Nganggo quote cache (umur %.1f detik)", age)
+        return hit[1]
+
+    def get_quote_from_kyoko(self, amount_eth, slippage=0.01, timeout=30):
+        """Request route/quote from Kyoko API with tolerant parsing."""
+        # Convert to wei
+        amount_wei = eth_to_wei(amount_eth)
+        key = (amount_wei, round(slippage, 4))
+        cached = self._cached_quote(key)
+        if cached is not None:
+            return cached
+        logger.info("🔄 Njaluk quote soko Kyoko API...")
+        payload, headers = self._kyoko_request(amount_wei, slippage)
         try:
-            r = requests.post(self.KYOKO_API_URL, json=payload, headers=headers, timeout=timeout)
+            r = self._http.post(self.KYOKO_API_URL, json=payload, headers=headers, timeout=timeout)
             r.raise_for_status()
-            data = r.json()
-            print("✅ Quote diterimo soko Kyoko API")
+            data = orjson.loads(r.content)
+            self._quote_cache[key] = (time.monotonic(), data)
+            logger.info("✅ Quote diterimo soko Kyoko API")
             return data
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Gagal njaluk quote: {e}")
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error("❌ Gagal njaluk quote: %s", e)
             return None
 
     def check_balances(self):
-        eth_balance = self.w3.eth.get_balance(self.account.address)
+        # ETH balance + USDC balanceOf in one batch round-trip (decimals is cached)
+        eth_raw, bal_raw = self._batch_rpc([
+            ("eth_getBalance", [self.account.address, "latest"]),
+            ("eth_call", [{"to": self.usdc_contract.address, "data": self._bal_calldata}, "latest"]),
+        ])
+        if eth_raw is not None:
+            eth_balance = hex_or_int_to_int(eth_raw)
+        else:
+            eth_balance = self.w3.eth.get_balance(self.account.address)
         usdc_balance = 0
         try:
-            usdc_balance = self.usdc_contract.functions.balanceOf(self.account.address).call()
-            usdc_decimals = self.usdc_contract.functions.decimals().call()
-            usdc_balance_formatted = usdc_balance / (10 ** usdc_decimals)
+            if bal_raw and bal_raw != "0x":
+                usdc_balance = int(bal_raw, 16)
+            else:
+                usdc_balance = self._bal_fn.call()
+            if self._usdc_decimals is None:
+                self._usdc_decimals = self._dec_fn.call()
+            usdc_balance_formatted = usdc_balance / (10 ** self._usdc_decimals)
         except Exception:
             usdc_balance_formatted = None
-        print(f"💎 Balance ETH: {self.w3.from_wei(eth_balance, 'ether'):.6f}")
+        logger.info("💎 Balance ETH: %.6f", eth_balance / _WEI_PER_ETH)
         if usdc_balance_formatted is not None:
-            print(f"💎 Balance USDC: {usdc_balance_formatted:.6f}")
+            logger.info("💎 Balance USDC: %.6f", usdc_balance_formatted)
         else:
-            print("⚠️ Gagal baca balance USDC (cek ABI/contract address)")
+            logger.warning("⚠️ Gagal baca balance USDC (cek ABI/contract address)")
         return eth_balance, usdc_balance
 
     def prepare_tx_from_kyoko_txdata(self, tx_data):
@@ -203,263 +397,542 @@ class KyokoSwapBot:
 
     def simulate_call_and_estimate(self, tx_for_estimate):
         """
-        Try eth_call (simulate) to capture revert reason, then try estimate_gas with 'from' provided.
+        Try estimate_gas with 'from' provided; nodes embed revert data in the estimate error,
+        so eth_call (simulate) only runs when that error carries no usable revert reason.
         Returns (estimated_gas, revert_reason) where estimated_gas may be None if estimate fails.
         """
-        revert_reason = ""
-        estimated_gas = None
         tx_sim = {
             "from": self.account.address,
             "to": tx_for_estimate["to"],
             "data": tx_for_estimate.get("data", "0x"),
             "value": tx_for_estimate.get("value", 0)
         }
-        # First try eth_call to surface revert reason (does not change chain state)
+        revert_reason = ""
+        for attempt in range(2):
+            try:
+                est = self.w3.eth.estimate_gas(tx_sim)
+                return int(est), ""
+            except httpx.TimeoutException:
+                # retry once; after that let the caller fall back to API gas
+                if attempt:
+                    logger.warning("⚠️ estimate_gas timeout (2x)")
+                    return None, ""
+            except Exception as est_exc:
+                revert_reason = revert_reason_from_exception(est_exc)
+                break
+        if revert_reason:
+            return None, revert_reason
+
+        # Fallback: eth_call to surface revert reason (does not change chain state)
         try:
-            # eth_call may raise when contract reverts; use call to capture exception payload if any
             self.w3.eth.call(tx_sim, "latest")
         except Exception as call_exc:
-            # web3 exception message sometimes contains hex revert data; try to parse it
-            msg = str(call_exc)
-            # attempt to find 'data' hex in message
-            # common format: 'execution reverted: ...' or contains hex return data after 'revert'
-            for part in msg.split():
-                if part.startswith("0x") and len(part) > 10:
-                    reason = decode_revert_reason(part)
-                    if reason:
-                        revert_reason = reason
-                        break
-            if not revert_reason:
-                # fallback: if message contains readable reason
-                if "execution reverted" in msg:
-                    # extract trailing human readable part if present
-                    idx = msg.find("execution reverted")
-                    revert_reason = msg[idx:]
-                else:
-                    revert_reason = msg
-
-        # Then try estimate_gas (with from)
-        try:
-            est = self.w3.eth.estimate_gas(tx_sim)
-            estimated_gas = int(est)
-        except Exception as est_exc:
-            # try to decode revert reason from exception message
-            est_msg = str(est_exc)
-            for part in est_msg.split():
-                if part.startswith("0x") and len(part) > 10:
-                    reason = decode_revert_reason(part)
-                    if reason:
-                        revert_reason = revert_reason or reason
-                        break
-            if not revert_reason:
-                if "execution reverted" in est_msg:
-                    revert_reason = revert_reason or est_msg
-
-        return estimated_gas, revert_reason
+            revert_reason = revert_reason_from_exception(call_exc) or str(call_exc)
+        return None, revert_reason
 
-    def execute_swap(self, amount_eth, slippage=0.01):
-        """Execute a single swap using Kyoko quote+transaction data"""
-        print(f"💰 Lagi swap {amount_eth} ETH ke USDC...")
-        quote = self.get_quote_from_kyoko(amount_eth, slippage)
-        if not quote:
-            print("❌ Ora iso dapet quote")
-            return False
-
-        print("📊 Quote data diterimo, menyiapkan swap...")
+    def _tx_info_from_quote(self, quote):
+        """Pick the swap transaction out of a Kyoko quote and normalize it. Returns None if unusable."""
+        logger.info("📊 Quote data diterimo, menyiapkan swap...")
         # debug keys
-        print(f"📋 Keys dalam response: {list(quote.keys())}")
+        logger.debug("📋 Keys dalam response: %s", list(quote.keys()))
 
         # get transactions array tolerant
         txs = quote.get("transactions") or quote.get("txs") or quote.get("transactions_list") or []
         if not isinstance(txs, list) or len(txs) == 0:
-            print("❌ Ora ana data transaksi nang response")
-            return False
+            logger.error("❌ Ora ana data transaksi nang response")
+            return None
 
         # choose first tx by default
-        raw_tx = txs[0]
+        tx_info = self.prepare_tx_from_kyoko_txdata(txs[0])
+        if not tx_info["to"]:
+            logger.error("❌ To address ora ditemukan di response transaksi — cek respons Kyoko")
+            return None
 
-        tx_info = self.prepare_tx_from_kyoko_txdata(raw_tx)
-        to_address = tx_info["to"]
-        calldata = tx_info["data"]
-        value = tx_info["value"]
-        gas_from_api = tx_info["gas"] or 0
+        logger.info("📍 To Address: %s", tx_info['to'])
+        logger.info("📊 Value: %s wei (%s ETH)", tx_info['value'], tx_info['value'] / _WEI_PER_ETH)
+        if tx_info["gas"]:
+            logger.info("⛽ Gas (dari API): %s", tx_info['gas'])
+        return tx_info
 
-        if not to_address:
-            print("❌ To address ora ditemukan di response transaksi — cek respons Kyoko")
-            return False
+    def _remember_pending_block(self, block):
+        """
+        Cache the baseFee of a freshly fetched pending block, either a web3 AttributeDict
+        (int fields) or a raw JSON-RPC dict (hex fields). Returns the baseFee as int, or None.
+        """
+        base_fee = block.get("baseFeePerGas") if block is not None else None
+        if base_fee is None:
+            return None
+        base_fee = hex_or_int_to_int(base_fee)
+        self._pending_base_fee = (time.monotonic(), base_fee)
+        return base_fee
 
-        print(f"📍 To Address: {to_address}")
-        print(f"📊 Value: {value} wei ({self.w3.from_wei(value, 'ether')} ETH)")
-        if gas_from_api:
-            print(f"⛽ Gas (dari API): {gas_from_api}")
+    def _get_pending_base_fee_cached(self, fetch=True):
+        """
+        Pending baseFee reused for up to _PENDING_BLOCK_TTL seconds, so back-to-back and
+        parallel swaps share one eth_getBlockByNumber. With fetch=False a stale/missing
+        entry returns None (caller batches the fetch with other RPCs).
+        """
+        hit = self._pending_base_fee
+        if hit is not None and time.monotonic() - hit[0] < _PENDING_BLOCK_TTL:
+            return hit[1]
+        if not fetch:
+            return None
+        return self._remember_pending_block(self.w3.eth.get_block("pending"))
 
-        # fee fields
+    def _fee_context(self, fee_raw, base_fee=None):
+        """
+        Interpret the raw pending block (EIP-1559) or eth_gasPrice (legacy) RPC result.
+        base_fee: baseFee already taken from the pending-block cache; fee_raw is then unused for it.
+        Returns (base_fee, node_gas_price) where node_gas_price is a callable, so the
+        legacy gas price is only fetched from web3 when the raw result is missing.
+        On RPC timeout, falls back to the last seen baseFee, then to node gasPrice.
+        """
+        if self._eip1559 and base_fee is None:
+            if fee_raw is not None:
+                base_fee = self._remember_pending_block(fee_raw)
+            else:
+                try:
+                    base_fee = self._get_pending_base_fee_cached()
+                except httpx.TimeoutException:
+                    logger.warning("⚠️ RPC timeout njupuk pending block, nganggo fee sing terakhir")
+                    base_fee = self._last_base_fee
+                except Exception:
+                    base_fee = None
+        if base_fee is not None:
+            self._last_base_fee = base_fee
+
+        def node_gas_price():
+            if not self._eip1559 and fee_raw is not None:
+                gas_price = hex_or_int_to_int(fee_raw)
+            else:
+                try:
+                    gas_price = self.w3.eth.gas_price
+                except httpx.TimeoutException:
+                    if self._last_gas_price is None:
+                        raise
+                    logger.warning("⚠️ RPC timeout njupuk gasPrice, nganggo gasPrice sing terakhir")
+                    gas_price = self._last_gas_price
+            self._last_gas_price = gas_price
+            return gas_price
+
+        return base_fee, node_gas_price
+
+    def _fee_fields(self, tx_info, base_fee, node_gas_price):
+        """Fee fields for the final tx: API-provided fees first, then pending baseFee, then node gasPrice."""
         max_fee = tx_info.get("maxFeePerGas")
         max_priority = tx_info.get("maxPriorityFeePerGas")
         gas_price = tx_info.get("gasPrice")
 
         if max_fee and max_priority:
-            print(f"💰 Max Fee Per Gas: {max_fee}")
-            print(f"🎯 Max Priority Fee Per Gas: {max_priority}")
-        elif gas_price:
-            print(f"⚠️ Gas Price from API: {gas_price}")
-        else:
-            if self.supports_eip1559():
-                # derive sensible defaults from pending block
-                try:
-                    pending = self.w3.eth.get_block("pending")
-                    base = pending.get("baseFeePerGas", None)
-                    if base:
-                        # set maxPriority small gwei
-                        default_priority = self.w3.to_wei("1", "gwei")
-                        max_priority = default_priority
-                        max_fee = int(base * 2 + default_priority)
-                        print(f"ℹ️ EIP-1559 detected, using baseFee estimate. maxFee={max_fee}, maxPriority={max_priority}")
-                except Exception:
-                    pass
-            else:
-                gas_price = self.w3.eth.gas_price
-                print(f"⚠️ Using node gasPrice: {gas_price}")
+            logger.info("💰 Max Fee Per Gas: %s", max_fee)
+            logger.info("🎯 Max Priority Fee Per Gas: %s", max_priority)
+            return {"maxFeePerGas": int(max_fee), "maxPriorityFeePerGas": int(max_priority), "type": 2}
+        if gas_price:
+            logger.warning("⚠️ Gas Price from API: %s", gas_price)
+            return {"gasPrice": int(gas_price), "type": 0}  # legacy
+        if base_fee is not None:
+            # derive sensible defaults from pending block; set maxPriority small gwei
+            default_priority = _WEI_PER_GWEI
+            max_fee = int(base_fee * 2 + default_priority)
+            logger.info("ℹ️ EIP-1559 detected, using baseFee estimate. maxFee=%s, maxPriority=%s", max_fee, default_priority)
+            return {"maxFeePerGas": max_fee, "maxPriorityFeePerGas": default_priority, "type": 2}
+        gas_price = node_gas_price()
+        logger.warning("⚠️ Using node gasPrice: %s", gas_price)
+        return {"gasPrice": int(gas_price), "type": 0}
 
-        # Build transaction template for estimation/sending
-        tx_template = {
-            "to": Web3.to_checksum_address(to_address),
-            "data": calldata,
-            "value": int(value)
-        }
-
-        # Simulate + estimate gas
-        est_gas, revert_reason = self.simulate_call_and_estimate(tx_template)
+    def _gas_to_use(self, gas_from_api, est_gas, revert_reason):
+        """Buffered gas limit from node estimate (or API gas as fallback). None if neither is usable."""
         if est_gas:
-            print(f"⛽ Estimated gas (node): {est_gas}")
-            gas_to_use = int(max(gas_from_api or 0, est_gas) * self.GAS_BUFFER_MULTIPLIER)
+            logger.info("⛽ Estimated gas (node): %s", est_gas)
+            return int(max(gas_from_api or 0, est_gas) * self.GAS_BUFFER_MULTIPLIER)
+        # estimation failed -> show revert reason if any, fallback to API gas if present
+        if revert_reason:
+            logger.warning("⚠️ Ora iso estimate gas: %s", revert_reason)
         else:
-            # estimation failed -> show revert reason if any, fallback to API gas if present
-            if revert_reason:
-                print(f"⚠️ Ora iso estimate gas: {revert_reason}")
-            else:
-                print("⚠️ Ora iso estimate gas: unknown reason")
-            if gas_from_api and gas_from_api > 0:
-                gas_to_use = int(gas_from_api * self.GAS_BUFFER_MULTIPLIER)
-                print(f"ℹ️ Fallback pake gas dari API (dengan buffer {self.GAS_BUFFER_MULTIPLIER}x): {gas_to_use}")
-            else:
-                print("❌ Gagal dapet gas sama sekali (ora ana gas di API lan ora iso estimate). Batal.")
-                return False
+            logger.warning("⚠️ Ora iso estimate gas: unknown reason")
+        if gas_from_api and gas_from_api > 0:
+            gas_to_use = int(gas_from_api * self.GAS_BUFFER_MULTIPLIER)
+            logger.info("ℹ️ Fallback pake gas dari API (dengan buffer %sx): %s", self.GAS_BUFFER_MULTIPLIER, gas_to_use)
+            return gas_to_use
+        logger.error("❌ Gagal dapet gas sama sekali (ora ana gas di API lan ora iso estimate). Batal.")
+        return None
+
+    def _checksum(self, address):
+        """Web3.to_checksum_address memoized per address string (it runs keccak on every call)."""
+        cs = self._checksum_cache.get(address)
+        if cs is None:
+            cs = self._checksum_cache[address] = Web3.to_checksum_address(address)
+        return cs
 
-        # Build final tx dict with appropriate fee fields
+    def _build_static_template(self, quote):
+        """
+        Immutable part of the swap tx for a quote: checksummed 'to', calldata bytes and value.
+        Returns (template, tx_info), or None if the quote is unusable. While the same (cached)
+        quote object comes back, the previous result is reused; only nonce/fees/gas change.
+        """
+        cached = self._template_cache
+        if cached is not None and cached[0] is quote:
+            return cached[1]
+        tx_info = self._tx_info_from_quote(quote)
+        if not tx_info:
+            return None
+        template = {
+            "to": self._checksum(tx_info["to"]),
+            "data": Web3.to_bytes(hexstr=tx_info["data"]),
+            "value": int(tx_info["value"])
+        }
+        self._template_cache = (quote, (template, tx_info))
+        return template, tx_info
+
+    def _finalize_and_send(self, template, nonce, fees, gas, revert_reason, send_turn=None):
+        """
+        Complete template with nonce/fees/gas, report, then sign/send and wait for the receipt
+        (or preview it in dry-run mode).
+        send_turn: optional (wait_turn, mark_sent) pair from parallel mode; wait_turn() blocks
+        until the previous nonce is broadcast and returns False if it never will be.
+        Returns wei spent (value + gas fee, 0 in dry-run) on success, None on failure.
+        """
         tx_final = {
-            "to": tx_template["to"],
-            "value": tx_template["value"],
-            "gas": gas_to_use,
-            "data": calldata,
-            "nonce": self.w3.eth.get_transaction_count(self.account.address),
-            "chainId": self.w3.eth.chain_id,
+            "to": template["to"],
+            "value": template["value"],
+            "gas": gas,
+            "data": template["data"],
+            "nonce": nonce,
+            "chainId": self._chain_id,
             # include 'from' only for simulation/estimate; not required in signed tx payload
         }
+        tx_final.update(fees)
 
-        # If EIP-1559 supported or API provided fields, use them
-        if max_fee and max_priority:
-            tx_final["maxFeePerGas"] = int(max_fee)
-            tx_final["maxPriorityFeePerGas"] = int(max_priority)
-            tx_final["type"] = 2
-        elif gas_price:
-            tx_final["gasPrice"] = int(gas_price)
-            tx_final["type"] = 0  # legacy
-        else:
-            # fallback to node gas_price (legacy) if EIP-1559 not used
-            if self.supports_eip1559():
-                # Already set max_fee earlier if possible; if still not set, derive conservative defaults
-                try:
-                    pending = self.w3.eth.get_block("pending")
-                    base = pending.get("baseFeePerGas", 0)
-                    default_priority = self.w3.to_wei("1", "gwei")
-                    tx_final["maxPriorityFeePerGas"] = default_priority
-                    tx_final["maxFeePerGas"] = int(base * 2 + default_priority)
-                    tx_final["type"] = 2
-                    print(f"ℹ️ Fallback EIP-1559 fees: maxFeePerGas={tx_final['maxFeePerGas']}, maxPriorityFeePerGas={tx_final['maxPriorityFeePerGas']}")
-                except Exception:
-                    tx_final["gasPrice"] = self.w3.eth.gas_price
-                    tx_final["type"] = 0
-            else:
-                tx_final["gasPrice"] = self.w3.eth.gas_price
-                tx_final["type"] = 0
-
-        print(f"🔢 Nonce: {tx_final['nonce']}")
-        print(f"⛽ Gas to send: {tx_final['gas']}")
+        logger.info("🔢 Nonce: %s", tx_final['nonce'])
+        logger.info("⛽ Gas to send: %s", tx_final['gas'])
 
         if revert_reason:
             # Helpful suggestion for common revert
             if "transfer to the zero address" in revert_reason.lower():
-                print("❗ Revert reason menunjukkan 'transfer to the zero address'.")
-                print("  -> Periksa apakah address token (USDC/WETH) benar dan bukan placeholder.")
-                print("  -> Pastikan Kyoko route tidak memasukkan address 0x000... sebagai target.")
-            print(f"⚠️ Revert reason (simulasi): {revert_reason}")
+                logger.warning("❗ Revert reason menunjukkan 'transfer to the zero address'.")
+                logger.warning("  -> Periksa apakah address token (USDC/WETH) benar dan bukan placeholder.")
+                logger.warning("  -> Pastikan Kyoko route tidak memasukkan address 0x000... sebagai target.")
+            logger.warning("⚠️ Revert reason (simulasi): %s", revert_reason)
 
         if self.DRY_RUN:
-            print("🔎 Dry-run mode aktif — transaksi TIDAK dikirim. Berikut preview tx_final:")
-            print(json.dumps({k: (v if not isinstance(v, bytes) else v.hex()) for k, v in tx_final.items()}, default=str, indent=2))
-            return True
+            logger.info("🔎 Dry-run mode aktif — transaksi TIDAK dikirim. Berikut preview tx_final:")
+            preview = {k: (v if not isinstance(v, bytes) else "0x" + v.hex()) for k, v in tx_final.items()}
+            try:
+                logger.info("%s", orjson.dumps(preview, default=str, option=orjson.OPT_INDENT_2).decode())
+            except orjson.JSONEncodeError:
+                # orjson caps ints at 64 bits; value in wei can exceed that
+                logger.info("%s", json.dumps(preview, default=str, indent=2))
+            return 0
 
-        # Sign and send
+        if self._stop.is_set() or (send_turn is not None and not send_turn[0]()):
+            logger.warning("⏭️ Nonce %s ora dikirim: swap sadurunge gagal utawa bot dihentikan", nonce)
+            return None
+
+        # Sign and send; a sent swap moves pool reserves, so cached quotes are stale
+        self._quote_cache.clear()
         try:
-            signed = self.w3.eth.account.sign_transaction(tx_final, self.PRIVATE_KEY)
+            signed = self.account.sign_transaction(tx_final)
             tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
-            print(f"📝 Swap transaction: {tx_hash.hex()}")
-            print("⏳ Nunggu konfirmasi...")
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=180)
-            if receipt and receipt.status == 1:
-                print(f"✅ Swap sukses di block: {receipt['blockNumber']}")
-                print(f"💸 Gas used: {receipt['gasUsed']}")
-                self.check_balances()
-                return True
+            if send_turn is not None:
+                send_turn[1]()
+            logger.info("📝 Swap transaction: %s", tx_hash.hex())
+            logger.info("⏳ Nunggu konfirmasi...")
+            receipt = self._wait_for_receipt(tx_hash, timeout=180)
+            if receipt is None:
+                logger.warning("🛑 Bot dihentikan, ora nunggu receipt %s", tx_hash.hex())
+                return None
+            if receipt.status == 1:
+                logger.info("✅ Swap sukses di block: %s", receipt['blockNumber'])
+                logger.info("💸 Gas used: %s", receipt['gasUsed'])
+                gas_price_paid = receipt.get("effectiveGasPrice") or tx_final.get("gasPrice") or tx_final["maxFeePerGas"]
+                # OP-stack receipts (Soneium) also carry the L1 data fee charged to the sender
+                l1_fee = hex_or_int_to_int(receipt.get("l1Fee") or 0)
+                return tx_final["value"] + receipt["gasUsed"] * gas_price_paid + l1_fee
             else:
-                print("❌ Swap gagal - status transaksi 0")
-                print("Receipt:", receipt)
-                return False
+                logger.error("❌ Swap gagal - status transaksi 0")
+                logger.error("Receipt: %s", receipt)
+                return None
         except Exception as send_exc:
             # decode revert if present in exception
-            exc_msg = str(send_exc)
-            found_reason = ""
-            for part in exc_msg.split():
-                if part.startswith("0x") and len(part) > 10:
-                    r = decode_revert_reason(part)
-                    if r:
-                        found_reason = r
-                        break
+            m = _REVERT_HEX_RE.search(str(send_exc))
+            found_reason = decode_revert_reason(m.group(0)) if m else ""
             if found_reason:
-                print(f"❌ Error ngirim transaksi: {found_reason}")
+                logger.error("❌ Error ngirim transaksi: %s", found_reason)
             else:
-                print(f"❌ Error ngirim transaksi: {send_exc}")
+                logger.error("❌ Error ngirim transaksi: %s", send_exc)
+            return None
+
+    def _wait_for_receipt(self, tx_hash, timeout=180):
+        """
+        wait_for_transaction_receipt in short slices so a Ctrl+C (self._stop) ends the wait.
+        Returns the receipt, or None if stopped; raises TimeExhausted after timeout seconds.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self.w3.eth.wait_for_transaction_receipt(
+                    tx_hash, timeout=min(1.0, max(deadline - time.monotonic(), 0.1)), poll_latency=0.1)
+            except TimeExhausted:
+                if self._stop.is_set():
+                    return None
+                if time.monotonic() >= deadline:
+                    raise
+
+    def execute_swap(self, amount_eth, slippage=0.01, nonce=None, send_turn=None):
+        """
+        Execute a single swap using Kyoko quote+transaction data.
+        nonce: pre-assigned nonce (parallel mode); fetched from chain when None.
+        send_turn: broadcast ordering hooks for parallel mode, see _finalize_and_send.
+        """
+        logger.info("💰 Lagi swap %s ETH ke USDC...", amount_eth)
+        quote = self.get_quote_from_kyoko(amount_eth, slippage)
+        if not quote:
+            logger.error("❌ Ora iso dapet quote")
+            return False
+
+        built = self._build_static_template(quote)
+        if not built:
             return False
+        tx_template, tx_info = built
+        self._ensure_eip1559()
+
+        # nonce plus pending block (EIP-1559) or node gasPrice (legacy) in one batch round-trip;
+        # a pending baseFee fetched within the last second is reused instead
+        base_fee = self._get_pending_base_fee_cached(fetch=False) if self._eip1559 else None
+        calls = []
+        if nonce is None:
+            calls.append(("eth_getTransactionCount", [self.account.address, "latest"]))
+        if base_fee is None:
+            calls.append(("eth_getBlockByNumber", ["pending", False]) if self._eip1559 else ("eth_gasPrice", []))
+        results = self._batch_rpc(calls) if calls else []
+        if nonce is None:
+            nonce_raw = results.pop(0)
+            nonce = (hex_or_int_to_int(nonce_raw) if nonce_raw is not None
+                     else self.w3.eth.get_transaction_count(self.account.address))
+        fee_raw = results[0] if results else None
+        base_fee, node_gas_price = self._fee_context(fee_raw, base_fee)
+        fees = self._fee_fields(tx_info, base_fee, node_gas_price)
+
+        # Simulate + estimate gas
+        est_gas, revert_reason = self.simulate_call_and_estimate(tx_template)
+        gas_to_use = self._gas_to_use(tx_info["gas"], est_gas, revert_reason)
+        if gas_to_use is None:
+            return False
+
+        return self._finalize_and_send(tx_template, nonce, fees, gas_to_use, revert_reason,
+                                       send_turn) is not None
+
+    async def _rpc_async(self, http, method, params):
+        """Single raw JSON-RPC call over httpx.AsyncClient (web3.py is sync-only). Raises ValueError on RPC error."""
+        payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+        r = await http.post(self.RPC_URL, json=payload)
+        r.raise_for_status()
+        data = r.json()
+        if "error" in data:
+            raise ValueError(data["error"])
+        return data.get("result")
+
+    async def get_quote_from_kyoko_async(self, http, amount_eth, slippage=0.01, timeout=30):
+        """httpx.AsyncClient variant of get_quote_from_kyoko."""
+        amount_wei = eth_to_wei(amount_eth)
+        key = (amount_wei, round(slippage, 4))
+        cached = self._cached_quote(key)
+        if cached is not None:
+            return cached
+        logger.info("🔄 Njaluk quote soko Kyoko API...")
+        payload, headers = self._kyoko_request(amount_wei, slippage)
+        try:
+            r = await http.post(self.KYOKO_API_URL, json=payload, headers=headers, timeout=timeout)
+            r.raise_for_status()
+            data = orjson.loads(r.content)
+            self._quote_cache[key] = (time.monotonic(), data)
+            logger.info("✅ Quote diterimo soko Kyoko API")
+            return data
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error("❌ Gagal njaluk quote: %s", e)
+            return None
+
+    async def execute_swap_async(self, http, amount_eth, slippage=0.01):
+        """
+        Async variant of execute_swap. Once the quote arrives, gas estimation, nonce and
+        fee data are fetched concurrently instead of one after another.
+        Returns wei spent (value + gas fee, 0 in dry-run) on success, None on failure.
+        """
+        logger.info("💰 Lagi swap %s ETH ke USDC...", amount_eth)
+        quote = await self.get_quote_from_kyoko_async(http, amount_eth, slippage)
+        if not quote:
+            logger.error("❌ Ora iso dapet quote")
+            return None
+
+        built = self._build_static_template(quote)
+        if not built:
+            return None
+        tx_template, tx_info = built
+        if self._eip1559 is None:
+            await asyncio.to_thread(self._ensure_eip1559)
+        tx_sim = {"from": self.account.address, "to": tx_template["to"],
+                  "data": "0x" + tx_template["data"].hex(), "value": hex(tx_template["value"])}
+        fee_call = ("eth_getBlockByNumber", ["pending", False]) if self._eip1559 else ("eth_gasPrice", [])
+        cached_base_fee = self._get_pending_base_fee_cached(fetch=False) if self._eip1559 else None
+        est_raw, nonce_raw, fee_raw = await asyncio.gather(
+            self._rpc_async(http, "eth_estimateGas", [tx_sim]),
+            self._rpc_async(http, "eth_getTransactionCount", [self.account.address, "latest"]),
+            # skip the fee call when a pending baseFee from the last second is cached
+            self._rpc_async(http, *fee_call) if cached_base_fee is None else asyncio.sleep(0),
+            return_exceptions=True)
+
+        base_fee, node_gas_price = self._fee_context(None if isinstance(fee_raw, Exception) else fee_raw,
+                                                     cached_base_fee)
+        fees = self._fee_fields(tx_info, base_fee, node_gas_price)
+
+        if isinstance(est_raw, Exception):
+            est_gas, revert_reason = None, revert_reason_from_exception(est_raw)
+            if not revert_reason:
+                # no revert data in the estimate error; let the sync simulation dig it out
+                est_gas, revert_reason = await asyncio.to_thread(self.simulate_call_and_estimate, tx_template)
+        else:
+            est_gas, revert_reason = hex_or_int_to_int(est_raw), ""
+        gas_to_use = self._gas_to_use(tx_info["gas"], est_gas, revert_reason)
+        if gas_to_use is None:
+            return None
+
+        if isinstance(nonce_raw, Exception):
+            nonce = await asyncio.to_thread(self.w3.eth.get_transaction_count, self.account.address)
+        else:
+            nonce = hex_or_int_to_int(nonce_raw)
+        # signing + send + receipt wait stay on web3 (sync), off the event loop
+        return await asyncio.to_thread(self._finalize_and_send, tx_template, nonce, fees, gas_to_use, revert_reason)
+
+    async def _run_swap_loop_async(self, amount_eth, loop_count, wait_time, slippage, eth_balance):
+        """
+        Run the swap loop on one httpx.AsyncClient (HTTP/2); swaps stay sequential (nonce order).
+        eth_balance (wei) is tracked locally from what each swap spent and only
+        re-read from chain after a failure or when it looks too low. Returns success count.
+        """
+        amount_wei = eth_to_wei(amount_eth)
+        successful = 0
+        try:
+            async with httpx.AsyncClient(http2=True, timeout=httpx.Timeout(self.RPC_TIMEOUT),
+                                         limits=self._http_limits) as http:
+                async def refresh_balance():
+                    return hex_or_int_to_int(await self._rpc_async(http, "eth_getBalance", [self.account.address, "latest"]))
+
+                for i in range(loop_count):
+                    logger.info("\n🔄 Loop ke-%s saka %s", i+1, loop_count)
+                    logger.info("-" * 30)
+                    if amount_wei > eth_balance:
+                        # local figure may be stale (e.g. incoming transfer); confirm on chain
+                        eth_balance = await refresh_balance()
+                        if amount_wei > eth_balance:
+                            logger.error("❌ Balance ETH kurang. dibutuhake: %s, ana: %s", amount_eth, eth_balance / _WEI_PER_ETH)
+                            break
+                    spent = await self.execute_swap_async(http, amount_eth, slippage)
+                    if spent is not None:
+                        successful += 1
+                        eth_balance -= spent
+                        logger.info("💎 Balance ETH (estimasi): %.6f", eth_balance / _WEI_PER_ETH)
+                    else:
+                        logger.error("❌ Swap gagal nang loop ke-%s", i+1)
+                        # a reverted tx still burns gas; resync with chain
+                        eth_balance = await refresh_balance()
+                        # small delay then continue
+                        await asyncio.sleep(5)
+                        continue
+                    # Use user-defined wait_time between swaps (skip after last)
+                    if i < loop_count - 1 and wait_time > 0:
+                        logger.info("⏳ Tunggu %s detik sebelum swap berikutnya...", wait_time)
+                        await asyncio.sleep(wait_time)
+        except asyncio.CancelledError:
+            # Ctrl+C cancels this task, but a swap already handed to asyncio.to_thread keeps running
+            self._stop.set()
+            raise
+        return successful
+
+    def _run_swaps_parallel(self, amount_eth, loop_count, slippage):
+        """
+        Submit loop_count swaps concurrently from a thread pool, each with a pre-assigned
+        nonce (base + i). I/O-bound, so quoting/estimation overlap fine, but broadcasts go
+        strictly in nonce order: once a swap fails before it is sent, later nonces are not
+        sent either, so no tx is left stuck behind a nonce gap. Ctrl+C cancels queued swaps
+        and stops any further broadcast. Returns success count.
+        """
+        nonce_base = self.w3.eth.get_transaction_count(self.account.address, "pending")
+        self._ensure_eip1559()
+        if self._eip1559:
+            # warm the pending-block cache so the workers don't each fetch it
+            try:
+                self._get_pending_base_fee_cached()
+            except Exception:
+                pass
+        done = [threading.Event() for _ in range(loop_count)]
+        broadcast = [False] * loop_count
+        stop = threading.Event()
+
+        def swap(i):
+            def wait_turn():
+                if i > 0:
+                    # poll so an interrupt isn't stuck behind the previous swap's receipt wait
+                    while not done[i - 1].wait(0.2):
+                        if stop.is_set():
+                            return False
+                    if not broadcast[i - 1]:
+                        return False
+                return not stop.is_set()
+
+            def mark_sent():
+                broadcast[i] = True
+
+            try:
+                return self.execute_swap(amount_eth, slippage, nonce_base + i, (wait_turn, mark_sent))
+            finally:
+                done[i].set()
+
+        # workers pick tasks in submit order, so nonce i-1 is always running or done before i waits on it
+        success = 0
+        pool = ThreadPoolExecutor(max_workers=min(loop_count, 4))
+        try:
+            futures = [pool.submit(swap, i) for i in range(loop_count)]
+            for i, f in enumerate(futures):
+                try:
+                    success += 1 if f.result() else 0
+                except Exception as e:
+                    logger.error("💥 Swap nonce %s error: %s", nonce_base + i, e)
+        except KeyboardInterrupt:
+            # no further broadcasts: drop queued swaps, running ones bail out in wait_turn
+            stop.set()
+            self._stop.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown()
+        return success
 
     def run_swap_bot_cli(self):
-        print("🤖 Kyoko Swap Bot - Miwiti...")
-        print("=" * 50)
-        self.check_balances()
+        logger.info("🤖 Kyoko Swap Bot - Miwiti...")
+        logger.info("=" * 50)
+        eth_balance, _ = self.check_balances()
 
         try:
             amount_eth = float(input("📝 Ketik jumlah ETH yang arep diswap: ").strip())
         except Exception:
-            print("❌ Input ora bener, ketik angka")
+            logger.error("❌ Input ora bener, ketik angka")
             return
 
         if amount_eth <= 0:
-            print("❌ Amount kudu lebih soko 0")
+            logger.error("❌ Amount kudu lebih soko 0")
             return
 
-        eth_balance, _ = self.check_balances()
-        if amount_eth > float(self.w3.from_wei(eth_balance, "ether")):
-            print("❌ Balance ETH kurang")
+        if eth_to_wei(amount_eth) > eth_balance:
+            logger.error("❌ Balance ETH kurang")
             return
 
         try:
             loop_count = int(input("📝 Ketik jumlah loop (berapa kali swap): ").strip())
         except Exception:
-            print("❌ Input ora bener, ketik angka")
+            logger.error("❌ Input ora bener, ketik angka")
             return
 
         if loop_count <= 0:
-            print("❌ Loop count kudu lebih soko 0")
+            logger.error("❌ Loop count kudu lebih soko 0")
             return
 
         # PROMPT: ask user for wait_time (in seconds) between swaps
@@ -467,14 +940,14 @@ class KyokoSwapBot:
             wt_raw = input("⏱️ Ketik jeda antar swap dalam detik (boleh desimal, ketik 0 untuk tanpa jeda). Contoh '10' atau '2.5': ").strip()
             if wt_raw == "":
                 wait_time = 10.0  # default sama seperti sebelumnya
-                print(f"ℹ️ Tidak diisi -> menggunakan default wait_time = {wait_time} detik")
+                logger.info("ℹ️ Tidak diisi -> menggunakan default wait_time = %s detik", wait_time)
             else:
                 wait_time = float(wt_raw)
                 if wait_time < 0:
-                    print("❌ Jeda tidak boleh negatif. Gunakan 0 atau angka positif.")
+                    logger.error("❌ Jeda tidak boleh negatif. Gunakan 0 atau angka positif.")
                     return
         except Exception:
-            print("❌ Input jeda ora bener. Ketik angka (contoh: 10 atau 2.5).")
+            logger.error("❌ Input jeda ora bener. Ketik angka (contoh: 10 atau 2.5).")
             return
 
         try:
@@ -484,51 +957,57 @@ class KyokoSwapBot:
         except Exception:
             pass
 
+        parallel = False
+        if loop_count > 1:
+            try:
+                par = input("⚡ Mode paralel (kabeh swap dikirim bebarengan, nonce urut, tanpa jeda)? (y/n): ")
+                parallel = par.strip().lower() == "y"
+            except Exception:
+                pass
+
         slippage = 0.01
-        print(f"\n🔁 Konfigurasi Swap:")
-        print(f"   Jumlah ETH per swap: {amount_eth}")
-        print(f"   Jumlah loop: {loop_count}")
-        print(f"   Jeda antar swap (detik): {wait_time}")
-        print(f"   Slippage: {slippage * 100}%")
-        print(f"   From: ETH")
-        print(f"   To: USDC")
-        print("=" * 50)
+        logger.info("\n🔁 Konfigurasi Swap:")
+        logger.info("   Jumlah ETH per swap: %s", amount_eth)
+        logger.info("   Jumlah loop: %s", loop_count)
+        logger.info("   Jeda antar swap (detik): %s", wait_time if not parallel else '- (paralel)')
+        logger.info("   Slippage: %s%%", slippage * 100)
+        logger.info("   From: ETH")
+        logger.info("   To: USDC")
+        logger.info("=" * 50)
 
         confirm = input("🚀 Arep lanjut swap? (y/n): ").lower()
         if confirm != "y":
-            print("❌ Swap dibatalno")
+            logger.error("❌ Swap dibatalno")
             return
 
-        successful = 0
-        for i in range(loop_count):
-            print(f"\n🔄 Loop ke-{i+1} saka {loop_count}")
-            print("-" * 30)
-            eth_balance_now = self.w3.from_wei(self.w3.eth.get_balance(self.account.address), "ether")
-            if amount_eth > eth_balance_now:
-                print(f"❌ Balance ETH kurang. dibutuhake: {amount_eth}, ana: {eth_balance_now}")
-                break
-            ok = self.execute_swap(amount_eth, slippage)
-            if ok:
-                successful += 1
-            else:
-                print(f"❌ Swap gagal nang loop ke-{i+1}")
-                # small delay then continue
-                time.sleep(5)
-                continue
-            # Use user-defined wait_time between swaps (skip after last)
-            if i < loop_count - 1 and wait_time > 0:
-                print(f"⏳ Tunggu {wait_time} detik sebelum swap berikutnya...")
-                time.sleep(wait_time)
+        if parallel:
+            if eth_to_wei(amount_eth) * loop_count > eth_balance:
+                logger.error("❌ Balance ETH kurang kanggo %s swap paralel", loop_count)
+                return
+            successful = self._run_swaps_parallel(amount_eth, loop_count, slippage)
+        else:
+            successful = asyncio.run(self._run_swap_loop_async(amount_eth, loop_count, wait_time, slippage, eth_balance))
 
-        print(f"\n🎉 Swap rampung! Sukses: {successful} saka {loop_count}")
+        logger.info("\n🎉 Swap rampung! Sukses: %s saka %s", successful, loop_count)
+        if successful and not self.DRY_RUN:
+            self.check_balances()
 
 
 def main():
+    # LOG_LEVEL may be a level name (DEBUG, warning, ...) or a number; anything else falls back to INFO
+    level_env = os.getenv("LOG_LEVEL", "INFO").strip()
+    level = int(level_env) if level_env.isdigit() else logging.getLevelName(level_env.upper())
+    logging.basicConfig(level=level if isinstance(level, int) else logging.INFO,
+                        format="%(message)s", stream=sys.stdout)
+    if not isinstance(level, int):
+        logger.warning("⚠️ LOG_LEVEL %r ora dikenal, nganggo INFO", level_env)
+    # httpx logs every request at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
     if not os.getenv("PRIVATE_KEY"):
-        print("❌ PRIVATE_KEY ra ono nang file .env!")
+        logger.error("❌ PRIVATE_KEY ra ono nang file .env!")
         return
     if not os.getenv("RPC_URL"):
-        print("❌ RPC_URL ra ono nang file .env!")
+        logger.error("❌ RPC_URL ra ono nang file .env!")
         return
 
     private_key = os.getenv("PRIVATE_KEY")
@@ -541,14 +1020,16 @@ def main():
         rpc_url=rpc_url,
         kyoko_api_url=kyoko_api,
         dry_run=dry,
-        gas_buffer_multiplier=float(os.getenv("GAS_BUFFER_MULTIPLIER", "1.2"))
+        gas_buffer_multiplier=float(os.getenv("GAS_BUFFER_MULTIPLIER", "1.2")),
+        quote_cache_ttl=float(os.getenv("QUOTE_CACHE_TTL", "3.0")),
+        rpc_timeout=float(os.getenv("RPC_TIMEOUT", "8"))
     )
     try:
         bot.run_swap_bot_cli()
     except KeyboardInterrupt:
-        print("\n🛑 Bot ditokno")
+        logger.warning("\n🛑 Bot ditokno")
     except Exception as e:
-        print(f"💥 Error umum: {e}")
+        logger.error("💥 Error umum: %s", e)
 
 
 if __name__ == "__main__":